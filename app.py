@@ -6,29 +6,40 @@ sowie deren Kombinationen. Die Qualität der Kombinationen wird farblich dargest
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import os
+from st_aggrid import AgGrid, GridOptionsBuilder
 from PIL import Image  # Wird verwendet, um das Logo zu laden und anzuzeigen
-import math
 
 # Streamlit-Seitenlayout auf "wide" setzen, um mehr Platz für die Inhalte zu schaffen
 st.set_page_config(layout="wide")
 
+# Hintergrundfarben je Qualitätsklasse (q1: Qualität = 1, q2: Qualität = 2, q3: Qualität > 2)
+QUALITAETS_FARBEN = {
+    "q1": "rgba(0, 255, 0, 0.7)",
+    "q2": "rgba(255, 255, 0, 0.7)",
+    "q3": "rgba(255, 0, 0, 0.7)"
+}
+
 # 2. CSS-Stile für zentrierte Tabellen injizieren (HIER EINFÜGEN!)
 # CSS-Stile für Tabellen (Schriftgröße und Ausrichtung)
 st.markdown(
-    """
+    f"""
     <style>
-    table {
+    .q1 {{ background-color: {QUALITAETS_FARBEN["q1"]}; }}
+    .q2 {{ background-color: {QUALITAETS_FARBEN["q2"]}; }}
+    .q3 {{ background-color: {QUALITAETS_FARBEN["q3"]}; }}
+    table {{
         font-size: 20px !important;
-    }
-    table th {
+    }}
+    table th {{
         font-size: 20px !important;
         text-align: center !important;
-    }
-    table td {
+    }}
+    table td {{
         font-size: 40px !important;
         text-align: center !important;
-    }
+    }}
     </style>
     """,
     unsafe_allow_html=True
@@ -48,19 +59,19 @@ with col2:
 col1, col2, col3 = st.columns(3)
 with col1:
     st.markdown(
-        '<div style="background-color: rgba(0, 255, 0, 0.7); padding: 10px; border-radius: 5px; text-align: center;">'
+        '<div class="q1" style="padding: 10px; border-radius: 5px; text-align: center;">'
         '<strong>Qualität = 1</strong><br>Guter Drehmomentrippel</div>',
         unsafe_allow_html=True
     )
 with col2:
     st.markdown(
-        '<div style="background-color: rgba(255, 255, 0, 0.7); padding: 10px; border-radius: 5px; text-align: center;">'
+        '<div class="q2" style="padding: 10px; border-radius: 5px; text-align: center;">'
         '<strong>Qualität = 2</strong><br>Mittlerer Drehmomentrippel</div>',
         unsafe_allow_html=True
     )
 with col3:
     st.markdown(
-        '<div style="background-color: rgba(255, 0, 0, 0.7); padding: 10px; border-radius: 5px; text-align: center;">'
+        '<div class="q3" style="padding: 10px; border-radius: 5px; text-align: center;">'
         '<strong>Qualität > 2</strong><br>Schlechter Drehmomentrippel</div>',
         unsafe_allow_html=True
     )
@@ -83,22 +94,172 @@ EXCEL_PATH = os.path.join(os.path.dirname(__file__), "magnet.xlsx")
 if not os.path.exists(EXCEL_PATH):
     st.error(f"Excel-Datei nicht gefunden unter:\n{EXCEL_PATH}")
     st.stop()
-df = pd.read_excel(EXCEL_PATH, header=None)
 
-def berechne_qualitaet(row):
+
+@st.cache_data(show_spinner=False)
+def lade_excel(path, mtime):
+    """
+    Lädt die Excel-Datei und hält das Ergebnis im Streamlit-Cache.
+    Der Änderungszeitpunkt der Datei ist Teil des Cache-Schlüssels,
+    sodass eine geänderte Datei automatisch neu eingelesen wird.
+    Zusätzlich wird eine Parquet-Kopie neben der Excel-Datei abgelegt,
+    die bei späteren Starts deutlich schneller gelesen werden kann.
+
+    Args:
+        path (str): Pfad zur Excel-Datei.
+        mtime (float): Zeitpunkt der letzten Änderung der Datei.
+
+    Returns:
+        pd.DataFrame: Rohdaten der Excel-Datei ohne Kopfzeile.
+    """
+    parquet_path = os.path.splitext(path)[0] + ".parquet"
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= mtime:
+        try:
+            df = pd.read_parquet(parquet_path)
+            df.columns = df.columns.astype(int)  # Parquet speichert Spaltennamen als Text
+            return df
+        except Exception:
+            pass  # Beschädigte Kopie: aus der Excel-Datei neu einlesen und Kopie ersetzen
+
+    # Rust-basierter Reader statt openpyxl; calamine liest nur den belegten Zellbereich des Blatts
+    df = pd.read_excel(path, header=None, engine="calamine")
+
+    # Kopie zuerst in eine temporäre Datei schreiben und erst danach ersetzen,
+    # damit ein abgebrochener Schreibvorgang keine unvollständige Datei hinterlässt
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    try:
+        df.set_axis(df.columns.astype(str), axis=1).to_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except OSError:
+        # Ohne Schreibrechte wird weiterhin direkt aus der Excel-Datei gelesen
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
+
+def berechne_qualitaet(df):
+    """
+    Berechnet den Qualitätsfaktor für den Drehmomentrippel aller Zeilen.
+    Der Faktor (mod * rotor) / kgV(mod, rotor) entspricht dem größten
+    gemeinsamen Teiler und wird daher direkt mit np.gcd bestimmt.
+
+    Args:
+        df (pd.DataFrame): DataFrame mit den Spalten "Modulatorzahl" und "Polzahl Rotor".
+
+    Returns:
+        np.ndarray: Qualitätsfaktor je Zeile (1 = bester Wert, größer = schlechterer Rippel).
+    """
+    mod = df["Modulatorzahl"].round().to_numpy(np.int64)  # Modulatorzahl als Integer
+    rotor = df["Polzahl Rotor"].round().to_numpy(np.int64)  # Rotor-Polzahl als Integer
+    return np.gcd(mod, rotor)
+
+
+@st.cache_data(show_spinner=False)
+def erstelle_df_all(df):
+    """
+    Überführt die Blockstruktur der Excel-Datei in eine flache Tabelle.
+    Zeile 1 enthält die Polzahl des Stators, darunter folgen je Spalte
+    Blöcke aus fünf Zeilen (Rotor, Modulator, Übersetzung, Drehmomente).
+
+    Args:
+        df (pd.DataFrame): Rohdaten der Excel-Datei.
+
+    Returns:
+        pd.DataFrame: Eine Zeile pro Variante mit allen relevanten Kennwerten inkl. "Qualität".
+    """
+    n_blocks = (len(df) - 1) // 5  # Anzahl vollständiger Blöcke je Spalte
+    # Datenzeilen als Array der Form (Blöcke, 5, Spalten) auffassen
+    blocks = df.iloc[1:1 + 5 * n_blocks].to_numpy().reshape(n_blocks, 5, df.shape[1])
+
+    # Spaltenweise abflachen (order="F"), damit die Reihenfolge "Spalte für Spalte" erhalten bleibt
+    df_all = pd.DataFrame({
+        "Spalte": np.repeat(df.columns.to_numpy(), n_blocks),
+        "Polzahl Stator": np.repeat(df.iloc[0].to_numpy(), n_blocks),
+        "Polzahl Rotor": blocks[:, 0, :].ravel(order="F"),
+        "Modulatorzahl": blocks[:, 1, :].ravel(order="F"),
+        "Übersetzung": blocks[:, 2, :].ravel(order="F"),
+        "Drehmoment Modulator": blocks[:, 3, :].ravel(order="F"),
+        "Drehmoment Rotor": blocks[:, 4, :].ravel(order="F")
+    })
+    # Pol- und Modulatorzahlen sind ganzzahlig; Übersetzung und Drehmomente
+    # bleiben float64, damit Auswahlwerte und Filtergrenzen exakt den Excel-Werten entsprechen
+    for spalte in ["Polzahl Stator", "Polzahl Rotor", "Modulatorzahl"]:
+        df_all[spalte] = df_all[spalte].round().astype("int16")
+
+    # Qualitätsfaktor einmalig für alle Varianten berechnen
+    df_all["Qualität"] = berechne_qualitaet(df_all)
+    return df_all
+
+
+@st.cache_resource(show_spinner=False)
+def erstelle_sortierindex(df_all):
+    """
+    Sortiert die filterbaren Spalten einmalig, damit Wertebereiche per
+    Binärsuche statt durch einen Vergleich aller Zeilen gefunden werden.
+
+    Args:
+        df_all (pd.DataFrame): Flache Tabelle aus erstelle_df_all.
+
+    Returns:
+        dict: Je Spaltenname ein Tupel (Zeilenpositionen in Sortierreihenfolge, sortierte Werte).
+    """
+    sortierindex = {}
+    for spalte in ["Übersetzung", "Drehmoment Modulator", "Drehmoment Rotor"]:
+        werte = df_all[spalte].to_numpy()
+        reihenfolge = np.argsort(werte, kind="stable")
+        sortierindex[spalte] = (reihenfolge, werte[reihenfolge])
+    return sortierindex
+
+
+@st.cache_data(show_spinner=False)
+def filtere_varianten(_df_all, _sortierindex, datenstand, bereiche):
     """
-    Berechnet den Qualitätsfaktor für den Drehmomentrippel.
+    Filtert die Varianten auf die angegebenen Wertebereiche und speichert das
+    Ergebnis im Cache. Der Schlüssel besteht nur aus den Grenzwerten und dem
+    Datenstand, sodass Tabs mit unveränderten Eingaben sofort ein Ergebnis liefern.
 
     Args:
-        row (pd.Series): Eine Zeile des DataFrames mit den Spalten "Modulatorzahl" und "Polzahl Rotor".
+        _df_all (pd.DataFrame): Alle Varianten (wird nicht gehasht).
+        _sortierindex (dict): Sortierindex aus erstelle_sortierindex (wird nicht gehasht).
+        datenstand (float): Änderungszeitpunkt der Excel-Datei zur Invalidierung des Caches.
+        bereiche (tuple): Tupel aus (Spaltenname, Minimum, Maximum) je Filterbedingung.
 
     Returns:
-        float: Qualitätsfaktor (1 = bester Wert, größer = schlechterer Rippel).
+        pd.DataFrame: Alle Varianten, die sämtliche Bereiche erfüllen, in ursprünglicher Reihenfolge.
     """
-    mod = int(round(row["Modulatorzahl"]))  # Modulatorzahl als Integer
-    rotor = int(round(row["Polzahl Rotor"]))  # Rotor-Polzahl als Integer
-    kgv = (mod * rotor) // math.gcd(mod, rotor)  # Kleinstes gemeinsames Vielfaches berechnen
-    return (mod * rotor) / kgv  # Qualitätsfaktor zurückgeben
+    treffer = None
+    for spalte, minimum, maximum in bereiche:
+        reihenfolge, werte = _sortierindex[spalte]
+        # Bereichsgrenzen per Binärsuche im sortierten Array bestimmen; die Grenzen werden
+        # wie bei einem elementweisen Vergleich zuerst in den Datentyp der Spalte umgewandelt
+        start = np.searchsorted(werte, werte.dtype.type(minimum), side="left")
+        ende = np.searchsorted(werte, werte.dtype.type(maximum), side="right")
+        zeilen = np.sort(reihenfolge[start:ende])
+        treffer = zeilen if treffer is None else np.intersect1d(treffer, zeilen, assume_unique=True)
+    return _df_all.iloc[treffer]
+
+
+excel_mtime = os.path.getmtime(EXCEL_PATH)
+df = lade_excel(EXCEL_PATH, excel_mtime)
+# Mindestens eine Stator-Zeile und ein vollständiger Block aus fünf Zeilen werden benötigt
+if len(df) < 6 or df.shape[1] == 0:
+    st.error(
+        f"Die Excel-Datei hat einen unerwarteten Aufbau ({len(df)} Zeilen, {df.shape[1]} Spalten). "
+        "Erwartet werden eine Zeile mit den Stator-Polzahlen und darunter Blöcke aus je fünf Zeilen."
+    )
+    st.stop()
+if (len(df) - 1) % 5 != 0:
+    st.warning(
+        f"Die letzten {(len(df) - 1) % 5} Zeilen der Excel-Datei bilden keinen vollständigen Block "
+        "und werden ignoriert."
+    )
+df_all = erstelle_df_all(df)
+sortierindex = erstelle_sortierindex(df_all)
+# Sortierte Liste aller vorkommenden Übersetzungen für die Auswahlfelder
+ratio_list = np.sort(df_all["Übersetzung"].unique())
+
 
 def farbige_und_zentrierte_formatierung(df):
     """
@@ -107,40 +268,30 @@ def farbige_und_zentrierte_formatierung(df):
     Zentriert sowohl die Daten als auch die Spaltenüberschriften.
 
     Args:
-        df (pd.DataFrame): DataFrame mit den Daten, inkl. einer Spalte "Qualität".
+        df (pd.DataFrame): DataFrame mit den Daten, inkl. der vorberechneten Spalte "Qualität".
 
     Returns:
         pd.io.formats.style.Styler: Formatierter DataFrame mit farbiger Hintergrundformatierung und zentriertem Text.
     """
-    def farbe_und_zentrierung(qualitaet):
-        """
-        Gibt die CSS-Formatierung für eine Zelle basierend auf dem Qualitätsfaktor zurück.
-
-        Args:
-            qualitaet (float): Qualitätsfaktor der Zeile.
-
-        Returns:
-            str: CSS-String für die Hintergrundfarbe und Textausrichtung.
-        """
-        if qualitaet == 1:
-            return 'background-color: rgba(0, 255, 0, 0.7); text-align: center'
-        elif qualitaet == 2:
-            return 'background-color: rgba(255, 255, 0, 0.7); text-align: center'
-        else:
-            return 'background-color: rgba(255, 0, 0, 0.7); text-align: center'
-
-    # Qualitätsfaktor für jede Zeile berechnen
-    df["Qualität"] = df.apply(lambda row: berechne_qualitaet(row), axis=1)
+    # Hintergrundfarbe je Zeile einmalig aus dem Qualitätsfaktor bestimmen
+    qualitaet = df["Qualität"].to_numpy()
+    farben = np.where(
+        qualitaet == 1,
+        f'background-color: {QUALITAETS_FARBEN["q1"]}',
+        np.where(
+            qualitaet == 2,
+            f'background-color: {QUALITAETS_FARBEN["q2"]}',
+            f'background-color: {QUALITAETS_FARBEN["q3"]}'
+        )
+    )
+
     # DataFrame ohne Qualitäts-Spalte für die Anzeige erstellen
     df_ohne_qualitaet = df.drop(columns=["Qualität"])
 
-    # Styler erstellen und Formatierung anwenden
+    # Styler erstellen und die Zeilenfarben auf alle Spalten übertragen
     styled_df = df_ohne_qualitaet.style.apply(
-        lambda x: [
-            farbe_und_zentrierung(df.loc[i, "Qualität"])
-            for i in df.index
-        ],
-        axis=0
+        lambda x: np.repeat(farben[:, None], x.shape[1], axis=1),
+        axis=None
     ).set_table_styles([
         # Zentriert alle Spaltenüberschriften
         {'selector': 'th', 'props': [('text-align', 'center'), ('font-size', '20px')]},
@@ -151,366 +302,314 @@ def farbige_und_zentrierte_formatierung(df):
     return styled_df
 
 
+# Ab dieser Zeilenzahl wird auf den Styler verzichtet, da er jede Zelle einzeln mit CSS versieht
+MAX_GESTYLTE_ZEILEN = 100
+# Standardmäßig angezeigte Zeilen, um die an den Browser gesendete Datenmenge zu begrenzen
+MAX_ANGEZEIGTE_ZEILEN = 200
 
 
-# --- Tabs für die verschiedenen Suchfunktionen erstellen ---
-tab_uebersetzung, tab_rotor, tab_mod, tab_combo1, tab_combo2, tab_combo3 = st.tabs([
+def zeige_ergebnisse(df, key):
+    """
+    Zeigt die gefilterten Ergebnisse als Tabelle an. Kleine Ergebnismengen werden
+    farbig formatiert, größere ohne Styler mit einem Symbol für die Qualität.
+    Sehr große Ergebnismengen werden gekürzt, bis alle Zeilen angefordert werden.
+
+    Args:
+        df (pd.DataFrame): Anzuzeigende Daten, inkl. der Spalte "Qualität".
+        key (str): Eindeutiger Schlüssel für die Checkbox "Alle anzeigen" des Tabs.
+    """
+    if len(df) > MAX_ANGEZEIGTE_ZEILEN:
+        alle_anzeigen = st.checkbox("Alle anzeigen", key=key)
+        if not alle_anzeigen:
+            st.caption(f"{len(df)} Treffer, angezeigt werden die ersten {MAX_ANGEZEIGTE_ZEILEN}.")
+            df = df.head(MAX_ANGEZEIGTE_ZEILEN)
+
+    if len(df) <= MAX_GESTYLTE_ZEILEN:
+        st.dataframe(farbige_und_zentrierte_formatierung(df))
+        return
+
+    # Qualität als Symbol darstellen, Zahlenformatierung übernimmt der Browser
+    symbole = df["Qualität"].map({1: "🟢", 2: "🟡"}).fillna("🔴")
+    st.dataframe(
+        df.assign(Qualität=symbole),
+        width="stretch",
+        column_config={
+            "Übersetzung": st.column_config.NumberColumn(format="%.2f"),
+            "Drehmoment Modulator": st.column_config.NumberColumn(format="%.2f"),
+            "Drehmoment Rotor": st.column_config.NumberColumn(format="%.2f")
+        }
+    )
+
+
+# Spalten, die in allen Ergebnistabellen angezeigt werden
+ANZEIGE_SPALTEN = [
+    "Polzahl Stator",
+    "Polzahl Rotor",
+    "Modulatorzahl",
     "Übersetzung",
-    "Rotor-Drehmoment",
-    "Modulator-Drehmoment",
-    "Übersetzung + Rotor",
-    "Übersetzung + Modulator",
-    "Rotor + Modulator"
-])
+    "Drehmoment Modulator",
+    "Drehmoment Rotor",
+    "Qualität"
+]
+
+
+def uebersetzung_eingabe(
+    key,
+    toleranz_key,
+    toleranz_label="Toleranz (-)",
+    hilfe_auswahl="Wähle die gewünschte Übersetzung aus.",
+    hilfe_toleranz="Toleranz für die Übersetzung."
+):
+    """
+    Zeigt die Eingabefelder für Zielübersetzung und Toleranz an.
 
-# --- Daten aus der Excel-Datei extrahieren ---
-# Zeile 1 enthält die Polzahl des Stators für alle Varianten
-p_stator = df.iloc[0, :].tolist()
-results = []
-
-# Spaltenweise durch die Daten iterieren und die relevanten Werte extrahieren
-for col in df.columns:
-    stator = df.iloc[0, col]  # Polzahl Stator
-    start_row = 1  # Startzeile für die Blöcke
-    while start_row + 4 < len(df):
-        # Rotor-Polzahl, Modulatorzahl, Übersetzung, Modulator- und Rotor-Drehmoment extrahieren
-        rotor = df.iloc[start_row, col]
-        mod = df.iloc[start_row+1, col]
-        ratio = df.iloc[start_row+2, col]
-        torque_mod = df.iloc[start_row+3, col]
-        torque_rot = df.iloc[start_row+4, col]
-        results.append({
-            "Spalte": col,
-            "Polzahl Stator": stator,
-            "Polzahl Rotor": rotor,
-            "Modulatorzahl": mod,
-            "Übersetzung": ratio,
-            "Drehmoment Modulator": torque_mod,
-            "Drehmoment Rotor": torque_rot
-        })
-        start_row += 5  # Zum nächsten Block springen
-
-# DataFrame mit den extrahierten Daten erstellen
-df_all = pd.DataFrame(results)
+    Args:
+        key (str): Schlüssel des Auswahlfelds (None für automatisch vergebenen Schlüssel).
+        toleranz_key (str): Schlüssel des Toleranzfelds.
+        toleranz_label (str): Beschriftung des Toleranzfelds.
+        hilfe_auswahl (str): Hilfetext des Auswahlfelds.
+        hilfe_toleranz (str): Hilfetext des Toleranzfelds.
 
-# --- Tab: Suche nach Übersetzung ---
-with tab_uebersetzung:
-    st.subheader("Suche nach Übersetzung")
-    # Auswahl aller möglichen Übersetzungen
-    ratio_list = sorted(df_all["Übersetzung"].unique())
-    selected_ratio = st.selectbox(
+    Returns:
+        tuple: Gewählte Übersetzung sowie untere und obere Grenze des Filterbereichs.
+    """
+    ratio = st.selectbox(
         "Übersetzung auswählen",
         ratio_list,
-        help="Wähle die Zielübersetzung, die du ungefähr erreichen willst."
+        key=key,
+        help=hilfe_auswahl
     )
-    tolerance_Uebersetzung = st.number_input(
-        "Toleranz: ",
+    toleranz = st.number_input(
+        toleranz_label,
         min_value=0.0,
         value=1.0,
         step=0.1,
-        key="tolerance_gear_ratio",
-        help="Die Toleranz legt fest, wie weit die Ergebnisse vom Zielwert abweichen dürfen."
+        key=toleranz_key,
+        help=hilfe_toleranz
     )
-    # Bereich für die Filterung berechnen
-    min_gear_ratio = selected_ratio - tolerance_Uebersetzung
-    max_gear_ratio = selected_ratio + tolerance_Uebersetzung
-    st.markdown(f"**Gefiltert wird die Übersetzung zwischen {min_gear_ratio:.2f} und {max_gear_ratio:.2f}**")
-    # DataFrame nach Übersetzung filtern
-    gear_ratio_filtered = df_all[
-        (df_all["Übersetzung"] >= min_gear_ratio) &
-        (df_all["Übersetzung"] <= max_gear_ratio)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    result_display = gear_ratio_filtered[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display = farbige_und_zentrierte_formatierung(result_display.copy())
-    st.subheader("Alle Kombinationen für diese Übersetzung")
-    st.dataframe(styled_combo_display)
+    return ratio, ratio - toleranz, ratio + toleranz
 
 
-# --- Tab: Suche nach Rotor-Drehmoment ---
-with tab_rotor:
-    st.subheader("Nach Rotor-Drehmoment filtern")
-    # Eingabefelder für Ziel-Drehmoment und Toleranz
-    target_torque_Rotor = st.number_input(
-        "Ziel Rotor Drehmoment (Nm)",
+def drehmoment_eingabe(bauteil, key, toleranz_key, standard_toleranz=1.0, hilfe_ziel=None, hilfe_toleranz=None):
+    """
+    Zeigt die Eingabefelder für Ziel-Drehmoment und Toleranz eines Bauteils an.
+
+    Args:
+        bauteil (str): "Rotor" oder "Modulator".
+        key (str): Schlüssel des Ziel-Drehmomentfelds.
+        toleranz_key (str): Schlüssel des Toleranzfelds.
+        standard_toleranz (float): Voreingestellte Toleranz in Nm.
+        hilfe_ziel (str): Hilfetext des Ziel-Drehmomentfelds (optional).
+        hilfe_toleranz (str): Hilfetext des Toleranzfelds (optional).
+
+    Returns:
+        tuple: Untere und obere Grenze des Drehmomentbereichs in Nm.
+    """
+    ziel = st.number_input(
+        f"Ziel {bauteil} Drehmoment (Nm)",
         min_value=0.0,
         value=2.0,
         step=0.1,
-        key="target_torque_Rotor",
-        help="Wähle das Zieldrehmoment des Rotors aus."
+        key=key,
+        help=hilfe_ziel or f"Wähle das gewünschte {bauteil}-Drehmoment aus."
     )
-    tolerance_Rotor = st.number_input(
+    toleranz = st.number_input(
         "Toleranz (Nm)",
         min_value=0.0,
-        value=1.0,
+        value=standard_toleranz,
         step=0.1,
-        key="tolerance_torque_Rotor",
-        help="Die Toleranz definiert, wie weit weg man vom gewünschten Rotordrehmoment sein darf."
+        key=toleranz_key,
+        help=hilfe_toleranz or f"Toleranz für das {bauteil}-Drehmoment."
+    )
+    return ziel - toleranz, ziel + toleranz
+
+
+def zeige_treffer(titel, bereiche, key):
+    """
+    Filtert die Varianten auf die angegebenen Bereiche und zeigt die Treffer an.
+
+    Args:
+        titel (str): Überschrift über der Ergebnistabelle.
+        bereiche (tuple): Tupel aus (Spaltenname, Minimum, Maximum) je Filterbedingung.
+        key (str): Eindeutiger Schlüssel für die Checkbox "Alle anzeigen" des Tabs.
+    """
+    treffer = filtere_varianten(df_all, sortierindex, excel_mtime, bereiche)
+    st.subheader(titel)
+    zeige_ergebnisse(treffer[ANZEIGE_SPALTEN], key=key)
+
+
+# --- Tabs für die verschiedenen Suchfunktionen erstellen ---
+tab_uebersetzung, tab_rotor, tab_mod, tab_combo1, tab_combo2, tab_combo3, tab_alle = st.tabs([
+    "Übersetzung",
+    "Rotor-Drehmoment",
+    "Modulator-Drehmoment",
+    "Übersetzung + Rotor",
+    "Übersetzung + Modulator",
+    "Rotor + Modulator",
+    "Alle Varianten"
+])
+
+# --- Tab: Suche nach Übersetzung ---
+with tab_uebersetzung:
+    st.subheader("Suche nach Übersetzung")
+    _, min_gear_ratio, max_gear_ratio = uebersetzung_eingabe(
+        key=None,
+        toleranz_key="tolerance_gear_ratio",
+        toleranz_label="Toleranz: ",
+        hilfe_auswahl="Wähle die Zielübersetzung, die du ungefähr erreichen willst.",
+        hilfe_toleranz="Die Toleranz legt fest, wie weit die Ergebnisse vom Zielwert abweichen dürfen."
+    )
+    st.markdown(f"**Gefiltert wird die Übersetzung zwischen {min_gear_ratio:.2f} und {max_gear_ratio:.2f}**")
+    zeige_treffer(
+        "Alle Kombinationen für diese Übersetzung",
+        (("Übersetzung", min_gear_ratio, max_gear_ratio),),
+        key="alle_uebersetzung"
+    )
+
+# --- Tab: Suche nach Rotor-Drehmoment ---
+with tab_rotor:
+    st.subheader("Nach Rotor-Drehmoment filtern")
+    min_torque_Rotor, max_torque_Rotor = drehmoment_eingabe(
+        "Rotor",
+        key="target_torque_Rotor",
+        toleranz_key="tolerance_torque_Rotor",
+        hilfe_ziel="Wähle das Zieldrehmoment des Rotors aus.",
+        hilfe_toleranz="Die Toleranz definiert, wie weit weg man vom gewünschten Rotordrehmoment sein darf."
     )
-    # Bereich für die Filterung berechnen
-    min_torque_Rotor = target_torque_Rotor - tolerance_Rotor
-    max_torque_Rotor = target_torque_Rotor + tolerance_Rotor
     st.markdown(f"**Gefiltert wird zwischen {min_torque_Rotor:.2f} Nm und {max_torque_Rotor:.2f} Nm**")
-    # DataFrame nach Rotor-Drehmoment filtern
-    torque_filtered = df_all[
-        (df_all["Drehmoment Rotor"] >= min_torque_Rotor) &
-        (df_all["Drehmoment Rotor"] <= max_torque_Rotor)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    torque__Rotor_filtered_display = torque_filtered[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display_TRot = farbige_und_zentrierte_formatierung(torque__Rotor_filtered_display.copy())
-    st.subheader("Kombinationen im Drehmomentbereich")
-    st.dataframe(styled_combo_display_TRot)
+    zeige_treffer(
+        "Kombinationen im Drehmomentbereich",
+        (("Drehmoment Rotor", min_torque_Rotor, max_torque_Rotor),),
+        key="alle_rotor"
+    )
 
 # --- Tab: Suche nach Modulator-Drehmoment ---
 with tab_mod:
     st.subheader("Nach Modulator-Drehmoment filtern")
-    # Eingabefelder für Ziel-Drehmoment und Toleranz
-    target_torque_MOD = st.number_input(
-        "Ziel Modulator Drehmoment (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
+    min_torque_MOD, max_torque_MOD = drehmoment_eingabe(
+        "Modulator",
         key="target_torque_MOD",
-        help="Wähle das Zieldrehmoment des Modulators aus."
-    )
-    tolerance_MOD = st.number_input(
-        "Toleranz (Nm)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="tolerance_torque_MOD",
-        help="Die Toleranz definiert, wie weit weg man vom gewünschten Modulatordrehmoment sein darf."
+        toleranz_key="tolerance_torque_MOD",
+        hilfe_ziel="Wähle das Zieldrehmoment des Modulators aus.",
+        hilfe_toleranz="Die Toleranz definiert, wie weit weg man vom gewünschten Modulatordrehmoment sein darf."
     )
-    # Bereich für die Filterung berechnen
-    min_torque_MOD = target_torque_MOD - tolerance_MOD
-    max_torque_MOD = target_torque_MOD + tolerance_MOD
     st.markdown(f"**Gefiltert wird zwischen {min_torque_MOD:.2f} Nm und {max_torque_MOD:.2f} Nm**")
-    # DataFrame nach Modulator-Drehmoment filtern
-    torque_filtered_MOD = df_all[
-        (df_all["Drehmoment Modulator"] >= min_torque_MOD) &
-        (df_all["Drehmoment Modulator"] <= max_torque_MOD)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    torque_MOD_filtered_display = torque_filtered_MOD[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display_TMOD = farbige_und_zentrierte_formatierung(torque_MOD_filtered_display.copy())
-    st.subheader("Kombinationen im Drehmomentbereich")
-    st.dataframe(styled_combo_display_TMOD)
+    zeige_treffer(
+        "Kombinationen im Drehmomentbereich",
+        (("Drehmoment Modulator", min_torque_MOD, max_torque_MOD),),
+        key="alle_mod"
+    )
 
 # --- Tab: Kombi-Suche Übersetzung und Rotor-Drehmoment ---
 with tab_combo1:
     st.subheader("Kombi-Suche: Übersetzung UND Rotor-Drehmoment")
-    # Auswahl der Übersetzung und Toleranz
-    combo_ratio_TRot = st.selectbox(
-        "Übersetzung auswählen",
-        sorted(df_all["Übersetzung"].unique()),
+    combo_ratio_TRot, min_t_i_TRotor, max_t_i_TRotor = uebersetzung_eingabe(
         key="combo_ratio_TRotor_i",
-        help="Wähle die gewünschte Übersetzung aus."
+        toleranz_key="combo_ratio_TRotor_i_tol"
     )
-    combo_tolerance_i = st.number_input(
-        "Toleranz (-)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="combo_ratio_TRotor_i_tol",
-        help="Toleranz für die Übersetzung."
-    )
-    min_t_i_TRotor = combo_ratio_TRot - combo_tolerance_i
-    max_t_i_TRotor = combo_ratio_TRot + combo_tolerance_i
-    # Auswahl des Ziel-Drehmoments und Toleranz für den Rotor
-    combo_target_torque = st.number_input(
-        "Ziel Rotor Drehmoment (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
+    min_t_T, max_t_T = drehmoment_eingabe(
+        "Rotor",
         key="combo_ratio_TRotor_TRotor",
-        help="Wähle das gewünschte Rotor-Drehmoment aus."
+        toleranz_key="combo_ratio_TRotor_tol",
+        standard_toleranz=2.0
     )
-    combo_tolerance_T = st.number_input(
-        "Toleranz (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
-        key="combo_ratio_TRotor_tol",
-        help="Toleranz für das Rotor-Drehmoment."
-    )
-    min_t_T = combo_target_torque - combo_tolerance_T
-    max_t_T = combo_target_torque + combo_tolerance_T
     st.markdown(
         f"Gefiltert wird nach Übersetzung **{combo_ratio_TRot}** "
         f"UND Rotor-Drehmoment **zwischen {min_t_T:.2f} Nm und {max_t_T:.2f} Nm**."
     )
-    # DataFrame nach Übersetzung und Rotor-Drehmoment filtern
-    combo_filtered = df_all[
-        (df_all["Übersetzung"] >= min_t_i_TRotor) &
-        (df_all["Übersetzung"] <= max_t_i_TRotor) &
-        (df_all["Drehmoment Rotor"] >= min_t_T) &
-        (df_all["Drehmoment Rotor"] <= max_t_T)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    combo_display_TRot_i = combo_filtered[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display_i_TRot = farbige_und_zentrierte_formatierung(combo_display_TRot_i.copy())
-    st.subheader("Ergebnisse der Kombi-Suche")
-    st.dataframe(styled_combo_display_i_TRot)
+    zeige_treffer(
+        "Ergebnisse der Kombi-Suche",
+        (
+            ("Übersetzung", min_t_i_TRotor, max_t_i_TRotor),
+            ("Drehmoment Rotor", min_t_T, max_t_T)
+        ),
+        key="alle_combo_TRot_i"
+    )
 
 # --- Tab: Kombi-Suche Übersetzung und Modulator-Drehmoment ---
 with tab_combo2:
     st.subheader("Kombi-Suche: Übersetzung UND Modulator-Drehmoment")
-    # Auswahl der Übersetzung und Toleranz
-    combo_ratio_TMOD = st.selectbox(
-        "Übersetzung auswählen",
-        sorted(df_all["Übersetzung"].unique()),
+    combo_ratio_TMOD, min_t_i_TMOD, max_t_i_TMOD = uebersetzung_eingabe(
         key="combo_ratio_TMOD_i",
-        help="Wähle die gewünschte Übersetzung aus."
+        toleranz_key="combo_ratio_TMOD_i_tol"
     )
-    combo_tolerance_i = st.number_input(
-        "Toleranz (-)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="combo_ratio_TMOD_i_tol",
-        help="Toleranz für die Übersetzung."
-    )
-    min_t_i_TMOD = combo_ratio_TMOD - combo_tolerance_i
-    max_t_i_TMOD = combo_ratio_TMOD + combo_tolerance_i
-    # Auswahl des Ziel-Drehmoments und Toleranz für den Modulator
-    combo_target_torque = st.number_input(
-        "Ziel Modulator Drehmoment (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
+    min_t_T, max_t_T = drehmoment_eingabe(
+        "Modulator",
         key="combo_ratio_TMOD_TMOD",
-        help="Wähle das gewünschte Modulator-Drehmoment aus."
-    )
-    combo_tolerance = st.number_input(
-        "Toleranz (Nm)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="combo_ratio_TMOD_tol",
-        help="Toleranz für das Modulator-Drehmoment."
+        toleranz_key="combo_ratio_TMOD_tol"
     )
-    min_t_T = combo_target_torque - combo_tolerance
-    max_t_T = combo_target_torque + combo_tolerance
     st.markdown(
         f"Gefiltert wird nach Übersetzung **{combo_ratio_TMOD}** "
         f"UND Modulator-Drehmoment **zwischen {min_t_T:.2f} Nm und {max_t_T:.2f} Nm**."
     )
-    # DataFrame nach Übersetzung und Modulator-Drehmoment filtern
-    combo_filtered = df_all[
-        (df_all["Übersetzung"] >= min_t_i_TMOD) &
-        (df_all["Übersetzung"] <= max_t_i_TMOD) &
-        (df_all["Drehmoment Modulator"] >= min_t_T) &
-        (df_all["Drehmoment Modulator"] <= max_t_T)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    combo_display_TMOD_i = combo_filtered[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display_i_TMOD = farbige_und_zentrierte_formatierung(combo_display_TMOD_i.copy())
-    st.subheader("Ergebnisse der Kombi-Suche")
-    st.dataframe(styled_combo_display_i_TMOD)
+    zeige_treffer(
+        "Ergebnisse der Kombi-Suche",
+        (
+            ("Übersetzung", min_t_i_TMOD, max_t_i_TMOD),
+            ("Drehmoment Modulator", min_t_T, max_t_T)
+        ),
+        key="alle_combo_TMOD_i"
+    )
 
 # --- Tab: Kombi-Suche Rotor- und Modulator-Drehmoment ---
 with tab_combo3:
     st.subheader("Kombi-Suche: Rotor-Drehmoment + Modulator-Drehmoment")
-    # Auswahl des Ziel-Drehmoments und Toleranz für den Modulator
-    combo_target_torque_MOD = st.number_input(
-        "Ziel Modulator Drehmoment (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
+    min_t_MOD, max_t_MOD = drehmoment_eingabe(
+        "Modulator",
         key="combo_TRotor_TMOD",
-        help="Wähle das gewünschte Modulator-Drehmoment aus."
+        toleranz_key="combo_TRotor_TMOD_tol"
     )
-    combo_tolerance_MOD = st.number_input(
-        "Toleranz (Nm)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="combo_TRotor_TMOD_tol",
-        help="Toleranz für das Modulator-Drehmoment."
-    )
-    min_t_MOD = combo_target_torque_MOD - combo_tolerance_MOD
-    max_t_MOD = combo_target_torque_MOD + combo_tolerance_MOD
-    # Auswahl des Ziel-Drehmoments und Toleranz für den Rotor
-    combo_target_torque_Rotor = st.number_input(
-        "Ziel Rotor Drehmoment (Nm)",
-        min_value=0.0,
-        value=2.0,
-        step=0.1,
+    min_t_Rotor, max_t_Rotor = drehmoment_eingabe(
+        "Rotor",
         key="combo_target_Rotor",
-        help="Wähle das gewünschte Rotor-Drehmoment aus."
+        toleranz_key="combo_tol_Rotor"
     )
-    combo_tolerance_Rotor = st.number_input(
-        "Toleranz (Nm)",
-        min_value=0.0,
-        value=1.0,
-        step=0.1,
-        key="combo_tol_Rotor",
-        help="Toleranz für das Rotor-Drehmoment."
-    )
-    min_t_Rotor = combo_target_torque_Rotor - combo_tolerance_Rotor
-    max_t_Rotor = combo_target_torque_Rotor + combo_tolerance_Rotor
     st.markdown(
         f"Gefiltert wird nach Modulator-Drehmoment **zwischen {min_t_MOD:.2f} Nm und {max_t_MOD:.2f} Nm** "
         f"UND Rotor-Drehmoment **zwischen {min_t_Rotor:.2f} Nm und {max_t_Rotor:.2f} Nm**."
     )
-    # DataFrame nach Rotor- und Modulator-Drehmoment filtern
-    combo_filtered = df_all[
-        (df_all["Drehmoment Modulator"] >= min_t_MOD) &
-        (df_all["Drehmoment Modulator"] <= max_t_MOD) &
-        (df_all["Drehmoment Rotor"] >= min_t_Rotor) &
-        (df_all["Drehmoment Rotor"] <= max_t_Rotor)
-    ]
-    # Relevante Spalten für die Anzeige auswählen
-    combo_display_TRot_TMOD = combo_filtered[[
-        "Polzahl Stator",
-        "Polzahl Rotor",
-        "Modulatorzahl",
-        "Übersetzung",
-        "Drehmoment Modulator",
-        "Drehmoment Rotor"
-    ]]
-    # Formatierten DataFrame anzeigen
-    styled_combo_display_Trot_TMOD = farbige_und_zentrierte_formatierung(combo_display_TRot_TMOD.copy())
-    st.subheader("Ergebnisse der Kombi-Suche")
-    st.dataframe(styled_combo_display_Trot_TMOD)
+    zeige_treffer(
+        "Ergebnisse der Kombi-Suche",
+        (
+            ("Drehmoment Modulator", min_t_MOD, max_t_MOD),
+            ("Drehmoment Rotor", min_t_Rotor, max_t_Rotor)
+        ),
+        key="alle_combo_TRot_TMOD"
+    )
+
+# --- Tab: Alle Varianten mit Filterung im Browser ---
+with tab_alle:
+    st.subheader("Alle Varianten")
+    st.markdown(
+        "Filter und Sortierung erfolgen direkt in der Tabelle über die Spaltenköpfe, "
+        "ohne dass die Seite neu berechnet werden muss."
+    )
+    alle_display = df_all[ANZEIGE_SPALTEN]
+    # Grid mit Zahlenfiltern je Spalte konfigurieren
+    gb = GridOptionsBuilder.from_dataframe(alle_display)
+    gb.configure_default_column(
+        filter="agNumberColumnFilter",
+        sortable=True,
+        cellStyle={"textAlign": "center"}
+    )
+    gb.configure_column("Qualität", hide=True)
+    # Zeilen im Browser über CSS-Klassen anhand des Qualitätsfaktors einfärben
+    gb.configure_grid_options(
+        rowClassRules={
+            "q1": "data['Qualität'] === 1",
+            "q2": "data['Qualität'] === 2",
+            "q3": "data['Qualität'] > 2"
+        },
+        # Spalten beim Laden an die verfügbare Breite anpassen
+        autoSizeStrategy={"type": "fitGridWidth"}
+    )
+    AgGrid(
+        alle_display,
+        gridOptions=gb.build(),
+        custom_css={
+            f".{klasse}": {"background-color": f"{farbe} !important"}
+            for klasse, farbe in QUALITAETS_FARBEN.items()
+        },
+        update_on=[],  # Filter und Sortierung nicht an Python zurückmelden, damit kein Rerun ausgelöst wird
+        key="grid_alle_varianten"
+    )